@@ -1,5 +1,7 @@
 import streamlit as st
 import sys
+import importlib.util
+from importlib.metadata import version, PackageNotFoundError
 
 st.set_page_config(layout='centered')
 st.title('?? TESTE INSTALA??O PACOTES PYTHON')
@@ -15,16 +17,18 @@ packages = [
     'plotly',
     'openai',
     'langchain',
-    'scipy',
     'matplotlib'
 ]
 
+# find_spec verifica a instalacao sem executar o modulo
 for pkg in packages:
+    if importlib.util.find_spec(pkg) is None:
+        st.error(f'? {pkg}: nao instalado')
+        continue
     try:
-        __import__(pkg)
+        st.success(f'? {pkg} {version(pkg)}')
+    except PackageNotFoundError:
         st.success(f'? {pkg}')
-    except ImportError as e:
-        st.error(f'? {pkg}: {str(e)[:50]}')
 
 st.info('''
 **SE VER ? OPENAI E LANGCHAIN:**
@@ -1,7 +1,5 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime
 
 # ========== CONFIGURAÇÃO ==========
@@ -11,6 +9,37 @@ st.set_page_config(
     layout="wide"
 )
 
+# ========== DADOS ==========
+@st.cache_data(ttl=300, show_spinner=False)
+def get_stock_data(ticker, periodo):
+    """Busca info e histórico do ticker, com cache entre reruns (5 min)"""
+    from valuation_functions import fetch_info, fetch_history
+    return fetch_info(ticker), fetch_history(ticker, periodo)
+
+
+@st.cache_resource(ttl=300, max_entries=32, show_spinner=False)
+def build_price_chart(ticker, closes):
+    """Monta o gráfico de fechamento; em reruns com os mesmos dados devolve a mesma figura"""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=closes.index,
+        y=closes,
+        mode='lines',
+        name='Preço',
+        line=dict(color='#1E3A8A', width=2)
+    ))
+    
+    fig.update_layout(
+        title=f"{ticker} - Preço de Fechamento",
+        xaxis_title="Data",
+        yaxis_title="Preço",
+        height=400,
+        template="plotly_white"
+    )
+    return fig
+
 # ========== CSS ==========
 st.markdown("""
 <style>
@@ -110,9 +139,7 @@ else:
         with st.spinner(f"🔍 Buscando dados de {ticker}..."):
             try:
                 # ========== BUSCAR DADOS ==========
-                stock = yf.Ticker(ticker)
-                info = stock.info
-                hist = stock.history(period=periodo)
+                info, hist = get_stock_data(ticker, periodo)
                 
                 if hist.empty:
                     st.error(f"❌ Não foi possível obter dados para {ticker}")
@@ -170,23 +197,7 @@ else:
                     # ========== GRÁFICO ==========
                     st.subheader("📈 Histórico de Preços")
                     
-                    fig = go.Figure()
-                    fig.add_trace(go.Scatter(
-                        x=hist.index,
-                        y=hist['Close'],
-                        mode='lines',
-                        name='Preço',
-                        line=dict(color='#1E3A8A', width=2)
-                    ))
-                    
-                    fig.update_layout(
-                        title=f"{ticker} - Preço de Fechamento",
-                        xaxis_title="Data",
-                        yaxis_title="Preço",
-                        height=400,
-                        template="plotly_white"
-                    )
-                    
+                    fig = build_price_chart(ticker, hist['Close'])
                     st.plotly_chart(fig, use_container_width=True)
                     
                     st.markdown("---")
@@ -247,18 +258,18 @@ else:
                     st.subheader("📋 Últimos Pregões")
                     
                     # Formatar dataframe
-                    hist_display = hist.tail(10).copy()
-                    hist_display = hist_display[['Open', 'High', 'Low', 'Close', 'Volume']]
+                    hist_display = hist.tail(10)[['Open', 'High', 'Low', 'Close', 'Volume']]
                     hist_display.columns = ['Abertura', 'Máxima', 'Mínima', 'Fechamento', 'Volume']
                     
-                    # Formatar números
-                    hist_display['Abertura'] = hist_display['Abertura'].apply(lambda x: f"R$ {x:.2f}")
-                    hist_display['Máxima'] = hist_display['Máxima'].apply(lambda x: f"R$ {x:.2f}")
-                    hist_display['Mínima'] = hist_display['Mínima'].apply(lambda x: f"R$ {x:.2f}")
-                    hist_display['Fechamento'] = hist_display['Fechamento'].apply(lambda x: f"R$ {x:.2f}")
-                    hist_display['Volume'] = hist_display['Volume'].apply(lambda x: f"{x:,.0f}")
-                    
-                    st.dataframe(hist_display, use_container_width=True)
+                    # Formatar números (no cliente, mantendo as colunas numéricas)
+                    st.dataframe(
+                        hist_display,
+                        use_container_width=True,
+                        column_config={
+                            col: st.column_config.NumberColumn(format='R$ %.2f')
+                            for col in ['Abertura', 'Máxima', 'Mínima', 'Fechamento']
+                        } | {'Volume': st.column_config.NumberColumn(format='%d')}
+                    )
                     
                     st.markdown("---")
                     
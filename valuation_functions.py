@@ -1,11 +1,78 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from scipy import stats
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from functools import cached_property
+import threading
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
+# yfinance-cache é opcional (fora do requirements.txt): guarda o histórico
+# de preços em disco, invalidado por pregão. Importá-lo custa ~0.8 s
+# (scipy, exchange_calendars e um processo multiprocessing.Manager)
+try:
+    import yfinance_cache as yfc
+except ImportError:
+    yfc = None
+
+# Faixas de recomendação pelo desconto (%) do valor intrínseco:
+# < -20 VENDER | [-20, -10) REDUZIR | [-10, 10] NEUTRO | (10, 20] ACUMULAR | > 20 COMPRAR
+_LOWER_BUCKETS = np.array([-20, -10])
+_UPPER_BUCKETS = np.array([10, 20])
+_LABELS = np.array(['VENDER', 'REDUZIR', 'NEUTRO', 'ACUMULAR', 'COMPRAR'])
+_COLORS = np.array(['red', 'orange', 'yellow', 'lightgreen', 'green'])
+
+def fetch_info(ticker):
+    """
+    Busca o dict .info do ticker direto no Yahoo (cotações sempre atuais)
+    """
+    return yf.Ticker(ticker).info
+
+def fetch_history(ticker, period):
+    """
+    Busca o histórico de preços do ticker (yfinance-cache, quando instalado,
+    com fallback para o yfinance)
+    """
+    if yfc is not None:
+        try:
+            return yfc.Ticker(ticker).history(period=period)
+        except Exception as e:
+            print(f"Erro no yfinance-cache para {ticker}, usando yfinance: {e}")
+    return yf.Ticker(ticker).history(period=period)
+
+# yf.download guarda os resultados em estado global do módulo
+# (yfinance.shared) e não é thread-safe; serializa as chamadas entre sessões
+_download_lock = threading.Lock()
+
+# Cache de .info por ticker: {ticker: (instante da busca, info)}
+_INFO_TTL = 300
+_info_cache = {}
+_info_lock = threading.Lock()
+
+def _cached_info(ticker):
+    """
+    Retorna uma cópia do dict .info do ticker, reaproveitando a busca
+    no Yahoo por até _INFO_TTL segundos
+    """
+    now = time.monotonic()
+    with _info_lock:
+        entry = _info_cache.get(ticker)
+    
+    if entry is None or now - entry[0] > _INFO_TTL:
+        info = fetch_info(ticker)
+        entry = (now, info)
+        # Não guarda respostas vazias, para que a próxima chamada tente de novo
+        if info:
+            with _info_lock:
+                for t in [t for t, (ts, _) in _info_cache.items() if now - ts > _INFO_TTL]:
+                    del _info_cache[t]
+                _info_cache[ticker] = entry
+    
+    return dict(entry[1])
+
 class EquityValuation:
     def __init__(self, ticker, risk_free_rate=0.045, market_return=0.09):
         """
@@ -21,6 +88,7 @@ class EquityValuation:
         self.risk_free_rate = risk_free_rate
         self.market_return = market_return
         self.data = None
+        self._beta_cache = {}
         
     def get_financial_data(self, period="5y"):
         """
@@ -30,20 +98,60 @@ class EquityValuation:
             period (str): Período dos dados (1y, 5y, 10y, max)
         """
         # Dados do preço
+        # (demonstrativos e dividendos são buscados sob demanda, ver abaixo)
         self.price_data = self.stock.history(period=period)
         
-        # Informações da empresa
-        self.info = self.stock.info
-        
-        # Dados financeiros
-        self.income_stmt = self.stock.financials
-        self.balance_sheet = self.stock.balance_sheet
-        self.cash_flow = self.stock.cashflow
+        return self.price_data
+    
+    @cached_property
+    def info(self):
+        """
+        Informações da empresa (buscadas sob demanda)
+        """
+        return _cached_info(self.ticker)
+    
+    @cached_property
+    def income_stmt(self):
+        """
+        Demonstração de resultados anual (buscada sob demanda)
+        """
+        return self.stock.financials
+    
+    @cached_property
+    def balance_sheet(self):
+        """
+        Balanço patrimonial anual (buscado sob demanda)
+        """
+        return self.stock.balance_sheet
+    
+    @cached_property
+    def cash_flow(self):
+        """
+        Fluxo de caixa anual (buscado sob demanda)
+        """
+        return self.stock.get_cashflow(pretty=True, freq='yearly')
+    
+    @cached_property
+    def dividends(self):
+        """
+        Histórico de dividendos (buscado sob demanda)
+        """
+        return self.stock.dividends
+    
+    def fetch_all_statements(self):
+        """
+        Busca em paralelo todos os demonstrativos ainda não carregados
         
-        # Histórico de dividendos
-        self.dividends = self.stock.dividends
+        Útil quando vários demonstrativos serão usados; caso contrário,
+        basta acessar o atributo desejado.
+        """
+        names = [name for name in ('income_stmt', 'balance_sheet', 'cash_flow', 'dividends')
+                 if name not in self.__dict__]
         
-        return self.price_data
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            futures = [ex.submit(getattr, self, name) for name in names]
+            for future in futures:
+                future.result()
     
     def calculate_financial_ratios(self):
         """
@@ -97,28 +205,43 @@ class EquityValuation:
             benchmark (str): Índice de referência
             period (str): Período para cálculo
         """
+        key = (benchmark, period)
+        if key in self._beta_cache:
+            return self._beta_cache[key]
+        
         try:
-            # Obtém dados do ativo e benchmark
-            stock_returns = self.stock.history(period=period)['Close'].pct_change().dropna()
-            bench = yf.Ticker(benchmark)
-            bench_returns = bench.history(period=period)['Close'].pct_change().dropna()
+            # Obtém ativo e benchmark numa única requisição, já alinhados por data
+            with _download_lock:
+                closes = yf.download([self.ticker, benchmark], period=period,
+                                     progress=False, auto_adjust=True)['Close']
             
-            # Alinha as datas
-            aligned_data = pd.concat([stock_returns, bench_returns], axis=1, join='inner')
-            aligned_data.columns = ['stock', 'benchmark']
+            # Retornos diários em NumPy
+            close_s = closes[self.ticker].to_numpy()
+            close_b = closes[benchmark].to_numpy()
+            s = np.diff(close_s) / close_s[:-1]
+            b = np.diff(close_b) / close_b[:-1]
+            valid = np.isfinite(s) & np.isfinite(b)
+            s = s[valid]
+            b = b[valid]
+            if len(s) < 2:
+                raise ValueError("Dados insuficientes para calcular o beta")
             
-            # Calcula beta usando regressão linear
-            beta, alpha, _, _, _ = stats.linregress(
-                aligned_data['benchmark'].values, 
-                aligned_data['stock'].values
-            )
+            # Calcula beta pela forma fechada: cov(s, b) / var(b)
+            sm = s.mean()
+            bm = b.mean()
+            var_b = ((b - bm) ** 2).mean()
+            cov_sb = ((b - bm) * (s - sm)).mean()
+            beta = cov_sb / var_b
+            alpha = sm - beta * bm
             
-            return {
+            self._beta_cache[key] = {
                 'beta': beta,
                 'alpha': alpha,
-                'r_squared': beta**2 * (aligned_data['benchmark'].var() / aligned_data['stock'].var())
+                'r_squared': cov_sb**2 / (var_b * s.var())
             }
-        except:
+            return self._beta_cache[key]
+        except Exception as e:
+            print(f"Erro ao calcular beta: {e}")
             return {'beta': 1.0, 'alpha': 0, 'r_squared': 0}
     
     def calculate_wacc(self, beta, cost_of_debt=None, tax_rate=0.34):
@@ -162,7 +285,8 @@ class EquityValuation:
         except:
             return {'wacc': 0.09, 'cost_of_equity': 0.10, 'cost_of_debt': 0.06}
     
-    def dcf_valuation(self, growth_rate=0.05, terminal_growth=0.03, years=5):
+    def dcf_valuation(self, growth_rate=0.05, terminal_growth=0.03, years=5,
+                      beta_data=None, wacc_data=None):
         """
         Realiza valuation pelo método DCF
         
@@ -170,6 +294,8 @@ class EquityValuation:
             growth_rate (float): Taxa de crescimento dos FCFF
             terminal_growth (float): Taxa de crescimento terminal
             years (int): Número de anos de projeção
+            beta_data (dict): Resultado de calculate_beta (se None, calcula)
+            wacc_data (dict): Resultado de calculate_wacc (se None, calcula)
         """
         try:
             # Obtém Free Cash Flow atual
@@ -178,30 +304,27 @@ class EquityValuation:
             fcff = operating_cash_flow + capital_expenditure  # FCFF = OCF - Capex (Capex é negativo)
             
             # Calcula WACC
-            beta_data = self.calculate_beta()
-            wacc_data = self.calculate_wacc(beta_data['beta'])
+            if wacc_data is None:
+                if beta_data is None:
+                    beta_data = self.calculate_beta()
+                wacc_data = self.calculate_wacc(beta_data['beta'])
             wacc = wacc_data['wacc']
             
             # Projeta FCFF
-            fcff_projections = []
-            for year in range(1, years + 1):
-                fcff_projected = fcff * ((1 + growth_rate) ** year)
-                fcff_projections.append(fcff_projected)
+            years_arr = np.arange(1, years + 1)
+            fcff_projections = fcff * (1 + growth_rate) ** years_arr
             
             # Calcula valor terminal
             terminal_fcff = fcff_projections[-1] * (1 + terminal_growth)
             terminal_value = terminal_fcff / (wacc - terminal_growth)
             
             # Desconta fluxos
-            present_values = []
-            for i, fcff_proj in enumerate(fcff_projections):
-                pv = fcff_proj / ((1 + wacc) ** (i + 1))
-                present_values.append(pv)
+            present_values = fcff_projections / (1 + wacc) ** years_arr
             
             pv_terminal = terminal_value / ((1 + wacc) ** years)
             
             # Valor da empresa
-            enterprise_value = sum(present_values) + pv_terminal
+            enterprise_value = present_values.sum() + pv_terminal
             
             # Ajusta para valor do equity
             net_debt = self.info.get('totalDebt', 0) - self.info.get('cash', 0)
@@ -231,25 +354,43 @@ class EquityValuation:
         Args:
             peers (list): Lista de tickers de empresas comparáveis
         """
-        peer_data = []
+        peers = list(peers)
+        metrics = {
+            'market_cap': 'marketCap',
+            'pe_ratio': 'trailingPE',
+            'ev_ebitda': 'enterpriseToEbitda',
+            'pb_ratio': 'priceToBook',
+            'ps_ratio': 'priceToSalesTrailing12Months'
+        }
         
-        for peer in peers:
-            try:
-                peer_stock = yf.Ticker(peer)
-                peer_info = peer_stock.info
-                
-                peer_data.append({
-                    'ticker': peer,
-                    'market_cap': peer_info.get('marketCap', np.nan),
-                    'pe_ratio': peer_info.get('trailingPE', np.nan),
-                    'ev_ebitda': peer_info.get('enterpriseToEbitda', np.nan),
-                    'pb_ratio': peer_info.get('priceToBook', np.nan),
-                    'ps_ratio': peer_info.get('priceToSalesTrailing12Months', np.nan)
-                })
-            except:
-                continue
+        # Colunas pré-alocadas, preenchidas conforme os peers chegam
+        columns = {col: np.full(len(peers), np.nan) for col in metrics}
+        ok = np.zeros(len(peers), dtype=bool)
         
-        return pd.DataFrame(peer_data)
+        # Busca os peers em paralelo (I/O bound), com prazo de 10s no total
+        ex = ThreadPoolExecutor(max_workers=8)
+        futures = {ex.submit(_cached_info, peer): i for i, peer in enumerate(peers)}
+        try:
+            for future in as_completed(futures, timeout=10):
+                i = futures[future]
+                try:
+                    peer_info = future.result()
+                    for col, key in metrics.items():
+                        columns[col][i] = peer_info.get(key, np.nan)
+                    ok[i] = True
+                except Exception as e:
+                    print(f"Erro ao buscar dados de {peers[i]}: {e}")
+        except FuturesTimeoutError:
+            pending = [peers[i] for future, i in futures.items() if not future.done()]
+            print(f"Tempo esgotado ao buscar dados de: {', '.join(pending)}")
+        finally:
+            # Não espera requisições travadas
+            ex.shutdown(wait=False, cancel_futures=True)
+        
+        # Mantém a ordem original dos peers, sem os que falharam
+        tickers = [peer for peer, valid in zip(peers, ok) if valid]
+        return pd.DataFrame({'ticker': tickers,
+                             **{col: arr[ok] for col, arr in columns.items()}})
     
     def get_summary(self):
         """
@@ -262,8 +403,11 @@ class EquityValuation:
         summary['sector'] = self.info.get('sector', 'N/A')
         summary['industry'] = self.info.get('industry', 'N/A')
         
+        # Beta (calculado uma única vez e reaproveitado no DCF)
+        beta_data = self.calculate_beta()
+        
         # Valuation DCF
-        dcf_result = self.dcf_valuation()
+        dcf_result = self.dcf_valuation(beta_data=beta_data)
         if dcf_result:
             summary.update(dcf_result)
         
@@ -272,7 +416,6 @@ class EquityValuation:
         summary.update(ratios)
         
         # Beta
-        beta_data = self.calculate_beta()
         summary.update(beta_data)
         
         # Recomendação
@@ -283,20 +426,10 @@ class EquityValuation:
             discount = ((intrinsic_value - current_price) / current_price) * 100
             summary['discount'] = discount
             
-            if discount > 20:
-                summary['recommendation'] = 'COMPRAR'
-                summary['recommendation_color'] = 'green'
-            elif discount > 10:
-                summary['recommendation'] = 'ACUMULAR'
-                summary['recommendation_color'] = 'lightgreen'
-            elif discount < -20:
-                summary['recommendation'] = 'VENDER'
-                summary['recommendation_color'] = 'red'
-            elif discount < -10:
-                summary['recommendation'] = 'REDUZIR'
-                summary['recommendation_color'] = 'orange'
-            else:
-                summary['recommendation'] = 'NEUTRO'
-                summary['recommendation_color'] = 'yellow'
+            # Limites inferiores são abertos à esquerda, os superiores à direita
+            idx = (np.searchsorted(_LOWER_BUCKETS, discount, side='right') +
+                   np.searchsorted(_UPPER_BUCKETS, discount, side='left'))
+            summary['recommendation'] = str(_LABELS[idx])
+            summary['recommendation_color'] = str(_COLORS[idx])
         
         return summary
\ No newline at end of file